@@ -24,10 +24,12 @@ class ColoredFormatter(logging.Formatter):
         logging.DEBUG: f"[{CYAN}%(levelname)s{RESET} - %(filename)s - %(funcName)s - %(lineno)d] %(message)s",
     }
 
+    # Format strings are parsed once, records only pick the formatter for their level
+    _formatters = {level: logging.Formatter(log_fmt) for level, log_fmt in FORMATS.items()}
+    _default_formatter = logging.Formatter()
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self._formatters.get(record.levelno, self._default_formatter).format(record)
 
 
 def logging_setup(verbosity: int, log_file: Optional[Path | str] = None):
@@ -1,8 +1,10 @@
 import subprocess
 from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from logging import error
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 BLENDER_SCRIPT = str(Path(__file__).parent / "zen_to_blend.py")
 
@@ -10,23 +12,24 @@ BLENDER_SCRIPT = str(Path(__file__).parent / "zen_to_blend.py")
 def parse_args() -> Dict[str, Any]:
     """
     Args:
-        input: Path to the input file
+        input: Paths to the input files
         blender_exe: Path to the blender executable
         game_directory: Path to the game directory
-        output: Path to the output file (defaults to current directory)
+        output: Path to the output file, or output directory for several inputs (defaults to current directory)
         scale: Scale factor (default: 0.01)
         waynet: Parse waynet (default: False)
+        jobs: Number of Blender processes to run in parallel (default: 1)
         verbosity: Verbosity level (0-3) (default: 0)
     """
     parser = ArgumentParser()
-    parser.add_argument("input", type=str, help="Input file name")
+    parser.add_argument("input", type=str, nargs="+", help="Input file names")
     parser.add_argument("blender-exe", type=Path, help="Path to the blender executable")
     parser.add_argument("game-directory", type=Path, help="Path to the game directory")
     parser.add_argument(
         "-o",
         "--output",
         type=Path,
-        help="Path to the output file (defaults to current directory)",
+        help="Path to the output file, or output directory for several inputs (defaults to current directory)",
     )
     parser.add_argument(
         "-s",
@@ -36,6 +39,13 @@ def parse_args() -> Dict[str, Any]:
         help="Scale factor (default: 0.01)",
     )
     parser.add_argument("-w", "--waynet", action="store_true", help="Parse waynet (default: False)")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of Blender processes to run in parallel (default: 1)",
+    )
     parser.add_argument(
         "-v",
         "--verbosity",
@@ -46,19 +56,54 @@ def parse_args() -> Dict[str, Any]:
     return parser.parse_args().__dict__
 
 
+def build_blender_args(
+    input: str,
+    blender_exe: Path,
+    game_directory: Path,
+    output: Path,
+    scale: float,
+    waynet: bool,
+    verbosity: int,
+) -> List[str | Path]:
+    blender_args = [
+        blender_exe,
+        "--background",
+        "--factory-startup",
+        "--python",
+        BLENDER_SCRIPT,
+        "--",
+        str(input),
+        str(game_directory),
+        str(output),
+        str(scale),
+        "-v",
+        str(verbosity),
+    ]
+
+    if waynet:
+        blender_args.append("-w")
+
+    return blender_args
+
+
+def run_blender(blender_args: List[str | Path]) -> int:
+    return subprocess.run(blender_args).returncode
+
+
 def main():
     args = parse_args()
 
-    input: str = args["input"]
+    inputs: List[str] = args["input"]
     blender_exe: Path = args["blender-exe"]
     game_directory: Path = args["game-directory"]
     output: Path | None = args["output"]
     scale: float = args["scale"]
     waynet: bool = args["waynet"]
+    jobs: int = args["jobs"]
     verbosity: int = args["verbosity"]
 
     path_errors = []
-    for path in [blender_exe, game_directory]:
+    for path in (blender_exe, game_directory):
         if not path.exists():
             message = f'"{str(path)}" does not exist'
             path_errors.append(message)
@@ -67,30 +112,35 @@ def main():
     if len(path_errors):
         exit(f'Following provided paths do not exist: {", ".join(path_errors)}')
 
-    if not output:
-        output = Path.cwd() / Path(input).with_suffix(".blend").name
+    # A single input keeps "-o" as the output file, several inputs treat it as the output directory
+    if len(inputs) == 1:
+        outputs = [output or Path.cwd() / Path(inputs[0]).with_suffix(".blend").name]
+    else:
+        if output and output.suffix:
+            exit(f'"{output}" looks like a file, "-o" must be a directory when converting several inputs')
 
-    blender_args = [
-        blender_exe,
-        "--background",
-        "--factory-startup",
-        "--python",
-        BLENDER_SCRIPT,
-        "--",
-        str(input),
-        str(game_directory),
-        str(output),
-        str(scale),
-        "-v",
-        str(verbosity),
+        output_directory = output or Path.cwd()
+        outputs = [output_directory / Path(input).with_suffix(".blend").name for input in inputs]
+
+        # Outputs are named after the input file only, inputs sharing a file name would overwrite each other
+        name_counts = Counter(path.name.lower() for path in outputs)
+        if duplicates := sorted(name for name, count in name_counts.items() if count > 1):
+            exit(f'Several inputs would be written to the same output: {", ".join(duplicates)}')
+
+        output_directory.mkdir(parents=True, exist_ok=True)
+
+    worklist = [
+        build_blender_args(input, blender_exe, game_directory, input_output, scale, waynet, verbosity)
+        for input, input_output in zip(inputs, outputs)
     ]
 
-    if waynet:
-        blender_args.append("-w")
+    # Each Blender process converts one world independently, so they can run side by side
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        return_codes = list(executor.map(run_blender, worklist))
 
-    completed_process = subprocess.run(blender_args)
-    if completed_process.returncode != 0:
-        raise Exception(completed_process.stderr)
+    failed_inputs = [input for input, return_code in zip(inputs, return_codes) if return_code != 0]
+    if failed_inputs:
+        raise Exception(f'Blender failed to convert: {", ".join(failed_inputs)}')
 
 
 if __name__ == "__main__":
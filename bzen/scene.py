@@ -1,54 +1,111 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from logging import error, info, warning
-from typing import Dict, Optional
+from functools import lru_cache
+from logging import info, warning
+from os import cpu_count
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import bpy
-from mathutils import Quaternion, Vector
+import numpy as np
 from visual import MaterialData, MeshData, VisualLoader
 from zenkit import Texture
 
+TEMPLATE_MATERIAL_NAME = "__bzen_template__"
+TEXTURE_NODE_NAME = "Texture"
+
+_template_material: Optional[bpy.types.Material] = None
+_visuals_cache: Dict[str, VisualLoader] = {}
+
 
 @dataclass(frozen=True, slots=True)
-class BlenderObjectData:
-    name: str = field(default_factory=str)
-    mesh: Optional[MeshData] = None
-    position: Vector = field(default_factory=Vector)
-    rotation: Quaternion = field(default_factory=Quaternion)
+class BlenderObjectTable:
+    names: List[str] = field(default_factory=list)
+    mesh_ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+    meshes: List[MeshData] = field(default_factory=list)
+    positions: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.float32))
+    rotations: np.ndarray = field(default_factory=lambda: np.empty((0, 4), dtype=np.float32))
 
+    def __len__(self) -> int:
+        return len(self.names)
 
-def flip_image_vertically(data: list[float], width: int, height: int) -> list[float]:
-    flipped = []
-    row_len = width * 4
+    def concatenate(self, other: "BlenderObjectTable") -> "BlenderObjectTable":
+        return BlenderObjectTable(
+            names=self.names + other.names,
+            mesh_ids=np.concatenate((self.mesh_ids, other.mesh_ids + np.int32(len(self.meshes)))),
+            meshes=self.meshes + other.meshes,
+            positions=np.concatenate((self.positions, other.positions)),
+            rotations=np.concatenate((self.rotations, other.rotations)),
+        )
 
-    for y in reversed(range(height)):
-        start = y * row_len
-        end = start + row_len
-        flipped.extend(data[start:end])
 
-    return flipped
+def flip_image_vertically(data: bytes, width: int, height: int) -> np.ndarray:
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+    return np.flipud(pixels)
 
 
-def create_texture(name: str, texture: Texture) -> bpy.types.Image:
-    img_bytes = texture.mipmap_rgba(0)
-    blender_img_data = flip_image_vertically([b / 255.0 for b in img_bytes], texture.width, texture.height)
+def decode_texture(texture: Texture) -> Tuple[int, int, np.ndarray]:
+    img_bytes = bytes(texture.mipmap_rgba(0))
+    return texture.width, texture.height, flip_image_vertically(img_bytes, texture.width, texture.height)
+
 
-    img = bpy.data.images.new(name, width=texture.width, height=texture.height, alpha=True)
-    img.pixels[:] = blender_img_data  # type: ignore
+def create_image(name: str, width: int, height: int, pixels: np.ndarray) -> bpy.types.Image:
+    img = bpy.data.images.new(name, width=width, height=height, alpha=True)
+    # Cast and normalize in one pass into a contiguous float32 buffer that foreach_set can copy directly
+    img.pixels.foreach_set(np.multiply(pixels, 1.0 / 255.0, dtype=np.float32).ravel())  # type: ignore
     img.pack()
 
     return img
 
 
-def create_material(material: MaterialData, visuals_cache: Dict[str, VisualLoader]) -> bpy.types.Material:
-    if existing_material := bpy.data.materials.get(material.name):
-        return existing_material
+def create_texture(name: str, texture: Texture) -> bpy.types.Image:
+    return create_image(name, *decode_texture(texture))
 
-    if not material.texture:
-        bmat = bpy.data.materials.new(name=material.name)
-        bmat.diffuse_color = material.color
-        return bmat
 
-    bmat = bpy.data.materials.new(name=material.name)
+def set_visuals_cache(visuals_cache: Dict[str, VisualLoader]):
+    global _visuals_cache
+    _visuals_cache = visuals_cache
+    resolve_image.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def resolve_image(texture_name: str) -> Optional[bpy.types.Image]:
+    texture_obj = _visuals_cache.get(texture_name)
+    if not texture_obj:
+        return None
+
+    return bpy.data.images.get(texture_name) or create_texture(texture_name, texture_obj())  # type: ignore
+
+
+def _decode_cached_texture(texture_name: str) -> Tuple[int, int, np.ndarray]:
+    return decode_texture(_visuals_cache[texture_name]())  # type: ignore
+
+
+def preload_textures(meshes: Iterable[MeshData]):
+    texture_names = {material.texture_key for mesh in meshes for material in mesh.materials if material.texture_key}
+    existing_images = frozenset(image.name for image in bpy.data.images)
+    pending = [name for name in texture_names if name in _visuals_cache and name not in existing_images]
+
+    # Decoding runs in zenkit off the main thread, images are created on the main thread as results arrive.
+    # Image creation is the slower side, so only a small window of decodes is queued to bound memory use.
+    max_workers = min(32, (cpu_count() or 1) + 4)
+    in_flight: Deque[Tuple[str, Future]] = deque()
+    with ThreadPoolExecutor(max_workers) as executor:
+        for name in pending:
+            in_flight.append((name, executor.submit(_decode_cached_texture, name)))
+            if len(in_flight) >= 2 * max_workers:
+                done_name, future = in_flight.popleft()
+                create_image(done_name, *future.result())
+
+        while in_flight:
+            done_name, future = in_flight.popleft()
+            create_image(done_name, *future.result())
+
+    info("Preloaded %d textures", len(pending))
+
+
+def _create_template_material() -> bpy.types.Material:
+    bmat = bpy.data.materials.new(name=TEMPLATE_MATERIAL_NAME)
     bmat.use_nodes = True
     bmat.use_backface_culling = True
     bmat.blend_method = "CLIP"
@@ -67,120 +124,156 @@ def create_material(material: MaterialData, visuals_cache: Dict[str, VisualLoade
     mix_shader = nodes.new("ShaderNodeMixShader")
     output_node = nodes.new("ShaderNodeOutputMaterial")
 
+    texture_node.name = TEXTURE_NODE_NAME
     texture_node.location = (-800, 0)
     invert_node.location = (-600, -100)
     diffuse_node.location = (-400, 0)
     mix_shader.location = (-200, 0)
     output_node.location = (200, 0)
 
-    texture_name = material.texture.lower()
-    texture_obj = visuals_cache.get(texture_name)  # type: ignore
-    image = (
-        (bpy.data.images.get(texture_name) or create_texture(texture_name, texture_obj())) if texture_obj else None  # type: ignore
-    )
-    texture_node.image = image  # type: ignore
+    diffuse_node.inputs[1].default_value = 1.0  # Roughness  # type: ignore
 
-    diffuse_node.inputs["Roughness"].default_value = 1.0  # type: ignore
-    bmat.diffuse_color = material.color
-
-    links.new(texture_node.outputs["Color"], diffuse_node.inputs["Color"])
-    links.new(texture_node.outputs["Alpha"], invert_node.inputs["Color"])
-    links.new(invert_node.outputs["Color"], mix_shader.inputs["Fac"])
-    links.new(diffuse_node.outputs["BSDF"], mix_shader.inputs[2])
-    links.new(mix_shader.outputs["Shader"], output_node.inputs["Surface"])
+    links.new(texture_node.outputs[0], diffuse_node.inputs[0])  # Color -> Color
+    links.new(texture_node.outputs[1], invert_node.inputs[1])  # Alpha -> Color
+    links.new(invert_node.outputs[0], mix_shader.inputs[0])  # Color -> Fac
+    links.new(diffuse_node.outputs[0], mix_shader.inputs[2])  # BSDF -> Shader
+    links.new(mix_shader.outputs[0], output_node.inputs[0])  # Shader -> Surface
 
     transparent_shader = nodes.new("ShaderNodeBsdfTransparent")
     transparent_shader.location = (-400, -200)
-    invert_node.inputs[0].default_value = 0.0  # type: ignore
-    links.new(transparent_shader.outputs["BSDF"], mix_shader.inputs[1])
+    invert_node.inputs[0].default_value = 0.0  # Fac  # type: ignore
+    links.new(transparent_shader.outputs[0], mix_shader.inputs[1])  # BSDF -> Shader
+
+    return bmat
+
+
+def get_template_material() -> bpy.types.Material:
+    global _template_material
+    if _template_material is None:
+        _template_material = _create_template_material()
+    return _template_material
+
+
+def create_material(material: MaterialData) -> bpy.types.Material:
+    if existing_material := bpy.data.materials.get(material.name):
+        return existing_material
+
+    if not material.texture:
+        bmat = bpy.data.materials.new(name=material.name)
+        bmat.diffuse_color = material.color
+        return bmat
+
+    # Copying the template duplicates its node tree in one call instead of rebuilding it node by node
+    bmat = get_template_material().copy()
+    bmat.name = material.name
+
+    bmat.node_tree.nodes[TEXTURE_NODE_NAME].image = resolve_image(material.texture_key)  # type: ignore
+    bmat.diffuse_color = material.color
 
     return bmat
 
 
 def create_obj_from_mesh(
-    unique_name: str, mesh_data: MeshData, visuals_cache: Dict[str, VisualLoader]
+    unique_name: str,
+    mesh_data: MeshData,
+    material_cache: Dict[str, bpy.types.Material],
 ) -> bpy.types.Object:
+    vertices, faces = mesh_data.vertices, mesh_data.faces
+    face_count = len(faces)
+
     mesh = bpy.data.meshes.new(unique_name)
-    mesh.from_pydata(mesh_data.vertices, [], mesh_data.faces)  # type: ignore
-    mesh.normals_split_custom_set(mesh_data.normals)  # type: ignore
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", vertices.ravel())
+    mesh.loops.add(face_count * 3)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * 3, 3, dtype=np.int32))
+
+    # Mirror from_pydata: flat shading where supported (Blender 4.1+), edges derived from polygons
+    try:
+        mesh.shade_flat()  # type: ignore
+    except AttributeError:
+        pass
+    mesh.update(calc_edges=True)
+    mesh.normals_split_custom_set(mesh_data.normals.tolist())  # type: ignore
 
-    if mesh_data.uvs:
+    if len(mesh_data.uvs):
         uv_layer = mesh.uv_layers.new(name="UVMap")
-        for i in range(len(uv_layer.data)):
-            uv_layer.data[i].uv = mesh_data.uvs[i]
+        uv_layer.data.foreach_set("uv", mesh_data.uvs.ravel())
 
     for material in mesh_data.materials:
-        mat = bpy.data.materials.get(material.name)
-        if not mat:
-            mat = create_material(material, visuals_cache)
+        mat = material_cache.get(material.name)
+        if mat is None:
+            mat = create_material(material)
+            material_cache[material.name] = mat
         mesh.materials.append(mat)
 
-    for index, polygon in enumerate(mesh.polygons):
-        if not len(mesh_data.materials):
-            warning("Mesh has no materials")
-            continue
-
-        polygon.material_index = mesh_data.material_indices[index]
+    if mesh_data.materials:
+        mesh.polygons.foreach_set("material_index", mesh_data.material_indices)
+    else:
+        warning("Mesh has no materials")
 
     mesh.update()
 
     obj = bpy.data.objects.new(unique_name, mesh)
     obj.rotation_mode = "QUATERNION"
-    bpy.context.collection.objects.link(obj)
 
     return obj
 
 
 def create_obj_from_vob_data(
-    unique_name: str, vob_data: BlenderObjectData, visuals_cache: Dict[str, VisualLoader]
-) -> Optional[bpy.types.Object]:
-    vob_mesh = vob_data.mesh
-
-    if not vob_mesh:
-        error(f"VOB {unique_name} has no mesh, skipping")
-        return None
-
-    obj = create_obj_from_mesh(unique_name, vob_mesh, visuals_cache)
-    obj.location = vob_data.position or Vector((0, 0, 0))
-    obj.rotation_quaternion = vob_data.rotation or Quaternion()
+    unique_name: str,
+    mesh_data: MeshData,
+    position: Sequence[float],
+    rotation: Sequence[float],
+    material_cache: Dict[str, bpy.types.Material],
+) -> bpy.types.Object:
+    obj = create_obj_from_mesh(unique_name, mesh_data, material_cache)
+    obj.location = position
+    obj.rotation_quaternion = rotation
 
     return obj
 
 
 def create_instance_from_vob_data(
-    unique_name: str, obj: bpy.types.Object, vob_data: BlenderObjectData
+    unique_name: str, obj: bpy.types.Object, position: Sequence[float], rotation: Sequence[float]
 ) -> bpy.types.Object:
     instance = bpy.data.objects.new(unique_name, obj.data)
     instance.rotation_mode = "QUATERNION"
-    instance.location = vob_data.position or Vector((0, 0, 0))
-    instance.rotation_quaternion = vob_data.rotation or Quaternion()
+    instance.location = position
+    instance.rotation_quaternion = rotation
 
-    bpy.context.collection.objects.link(instance)
     return instance
 
 
-def create_vobs(vobs: Dict[str, BlenderObjectData], visuals_cache: Dict[str, VisualLoader]):
-    success_count = 0
-    mesh_cache = set()
-    obj_cache = {}
+def link_objects(objects: Iterable[bpy.types.Object]):
+    link = bpy.context.collection.objects.link
+    for obj in objects:
+        link(obj)
 
-    for vob_name, vob_data in vobs.items():
-        vob_mesh = vob_data.mesh
-        result = None
 
-        if vob_mesh in mesh_cache:
-            existing_obj = obj_cache[vob_mesh]
-            result = create_instance_from_vob_data(vob_name, existing_obj, vob_data)
-        else:
-            result = create_obj_from_vob_data(vob_name, vob_data, visuals_cache)
-            if not result:
-                warning(f"VOB {vob_name} has no mesh, skipping")
-                continue
+def create_vobs(
+    vobs: BlenderObjectTable,
+    material_cache: Dict[str, bpy.types.Material],
+):
+    created_objects = []
+    obj_cache: Dict[int, bpy.types.Object] = {}
+
+    # Columns are converted to plain Python values once, bpy accepts them directly as locations and rotations
+    for vob_name, mesh_id, position, rotation in zip(
+        vobs.names, vobs.mesh_ids.tolist(), vobs.positions.tolist(), vobs.rotations.tolist()
+    ):
+        existing_obj = obj_cache.get(mesh_id)
 
-            mesh_cache.add(vob_mesh)
-            obj_cache[vob_mesh] = result
+        if existing_obj is not None:
+            result = create_instance_from_vob_data(vob_name, existing_obj, position, rotation)
+        else:
+            result = create_obj_from_vob_data(vob_name, vobs.meshes[mesh_id], position, rotation, material_cache)
+            obj_cache[mesh_id] = result
 
-        success_count += 1
+        created_objects.append(result)
 
+    # Objects are created unlinked and attached to the scene in one pass, followed by a single view layer update
+    link_objects(created_objects)
     bpy.context.view_layer.update()
-    info(f"Created {success_count} VOBs")
+    info("Created %d VOBs", len(created_objects))
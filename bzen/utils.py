@@ -1,8 +1,11 @@
 import sys
 from argparse import ArgumentParser, Namespace
-from os import scandir
+from functools import lru_cache
+from os import getcwd, lstat, scandir
+from os.path import join
 from pathlib import Path
 from subprocess import run
+from typing import Dict
 
 import bpy
 
@@ -10,45 +13,69 @@ ZENKIT_URL = "git+https://github.com/Zira3l137/ZenKit4Py.git"
 
 
 def with_suffix(path: str, suffix: str, replace: bool = False) -> str:
-    result = path.rsplit(".", 1)[0] if replace else path
+    result = trim_suffix(path) if replace else path
     return f"{result}.{suffix}"
 
 
 def suffix(path: str, dot: bool = False) -> str:
-    prefix = "." if dot else ""
-    return f"{prefix}{path.rsplit('.', 1)[-1]}"
+    _, separator, extension = path.rpartition(".")
+    if not separator:
+        return ""
+    return f".{extension}" if dot else extension
 
 
 def trim_suffix(path: str) -> str:
-    return path.rsplit(".", 1)[0]
+    head, separator, _ = path.rpartition(".")
+    return head if separator else path
+
+
+@lru_cache(maxsize=4096)
+def _lower_index(directory: str) -> Dict[str, str]:
+    index = {}
+    with scandir(directory) as entries:
+        for entry in entries:
+            index.setdefault(entry.name.lower(), entry.path)
+    return index
+
+
+def clear_case_cache():
+    _lower_index.cache_clear()
 
 
 def canonical_case_path(path: Path | str) -> Path:
     if isinstance(path, str):
         path = Path(path)
 
+    # Parse the path once and walk it as plain strings, lifting back to Path only for the result
     if path.is_absolute():
-        parts = path.parts
-        current = Path(parts[0])  # root ("/" on POSIX)
-        parts = parts[1:]
+        current, *parts = path.parts  # root ("/" on POSIX)
     else:
-        current = Path.cwd()
-        parts = path.parts
+        current, parts = getcwd(), path.parts
 
     for part in parts:
+        # Most components already have the on-disk case, a single lstat avoids listing the directory
+        candidate = join(current, part)
+        try:
+            lstat(candidate)
+        except OSError:
+            pass
+        else:
+            current = candidate
+            continue
+
         try:
-            entries = list(scandir(current))
+            index = _lower_index(current)
         except FileNotFoundError:
             raise FileNotFoundError(f"Directory does not exist: {current}")
 
-        matches = [e for e in entries if e.name.lower() == part.lower()]
+        match = index.get(part.lower())
 
-        if not matches:
+        if match is None:
             raise FileNotFoundError(f"No case-insensitive match for {part} in {current}")
 
-        current = Path(matches[0].path)
+        current = match
 
-    return current.resolve()
+    return Path(current).resolve()
 
 
 def blender_parse_cli() -> Namespace:
@@ -1,14 +1,21 @@
 import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import StrEnum
+from hashlib import blake2b
 from logging import error, info
-from os import scandir
+from operator import attrgetter
+from os import scandir, walk
+from os.path import join
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple, TypeAlias
+from sys import intern
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeAlias
 
+import numpy as np
 from mathutils import Matrix, Vector
-from utils import canonical_case_path, suffix, trim_suffix, with_suffix
+from utils import canonical_case_path, trim_suffix
 from zenkit import (
+    Material,
     Model,
     ModelHierarchy,
     ModelMesh,
@@ -17,6 +24,7 @@ from zenkit import (
     Texture,
     Vfs,
     VfsNode,
+    VfsOverwriteBehavior,
     VirtualObject,
     VisualDecal,
     World,
@@ -35,6 +43,9 @@ class VisualExtension(StrEnum):
     TEX = "tex"
 
 
+_visual_extension_values = frozenset(ve.value for ve in VisualExtension)
+_visual_extension_by_value = {ve.value: ve for ve in VisualExtension}
+
 _compiled_extension = {
     "3ds": VisualExtension.MRM,
     "asc": VisualExtension.MDL,
@@ -52,17 +63,22 @@ _load_visual = {
     VisualExtension.TEX: Texture.load,
 }
 
+# Keyed by source extension, called with the lowercased name stem so compiled names are a single concatenation
 _parse_visual_data = {
-    "3ds": lambda name, cache, scale: parse_multi_resolution_mesh(cache[name](), scale),
-    "asc": lambda name, cache, scale: parse_model(cache[name](), scale),
-    "mds": lambda name, cache, scale: parse_model_mesh(
-        cache[name](), cache[with_suffix(name, "mdh", True).lower()](), scale
-    ),
-    "mms": lambda name, cache, scale: parse_morph_mesh(cache[name](), scale),
+    "3ds": lambda stem, cache, scale: parse_multi_resolution_mesh(cache[f"{stem}.mrm"](), scale),
+    "asc": lambda stem, cache, scale: parse_model(cache[f"{stem}.mdl"](), scale),
+    "mds": lambda stem, cache, scale: parse_model_mesh(cache[f"{stem}.mdm"](), cache[f"{stem}.mdh"](), scale),
+    "mms": lambda stem, cache, scale: parse_morph_mesh(cache[f"{stem}.mmb"](), scale),
 }
 
 BASE_SCALE_MATRIX = Matrix().Scale(-1, 4, Vector((0, 1, 0)))
 BASE_ROTATION_MATRIX = Matrix().Rotation(math.radians(-90), 4, Vector((1, 0, 0)))
+BASE_TRANSFORM = BASE_ROTATION_MATRIX @ BASE_SCALE_MATRIX
+
+# Component getters for zenkit vectors, one C call returns the tuple (ZenGin is Y-up, xzy swizzles to Blender Z-up)
+_get_xy = attrgetter("x", "y")
+_get_xyz = attrgetter("x", "y", "z")
+_get_xzy = attrgetter("x", "z", "y")
 
 VISUAL_CATEGORIES = ["anims", "textures", "meshes"]
 VISUAL_ARCHIVES = [
@@ -77,49 +93,140 @@ class MaterialData:
     name: str
     color: Tuple[float, float, float, float]
     texture: Optional[str] = field(default=None)
+    texture_key: Optional[str] = field(init=False, repr=False, compare=False)
 
-    def __hash__(self):
-        return hash(self.name) + hash(self.color) + hash(self.texture)
+    def __post_init__(self):
+        # Lowercased once and interned, so visual cache lookups by texture name hit the identity fast path
+        object.__setattr__(self, "texture_key", intern(self.texture.lower()) if self.texture else None)
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, eq=False)
 class MeshData:
-    vertices: list[Vector] = field(default_factory=list)
-    faces: List[Tuple[int, int, int]] = field(default_factory=list)
-    normals: List[Vector] = field(default_factory=list)
-    uvs: List[Tuple[float, float]] = field(default_factory=list)
+    # Struct of arrays: vertices (N, 3) float32, faces (F, 3) int32, per-loop normals (F * 3, 3) float32,
+    # per-loop uvs (F * 3, 2) float32 and material_indices (F,) int32
+    vertices: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.float32))
+    faces: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.int32))
+    normals: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.float32))
+    uvs: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.float32))
     materials: List[MaterialData] = field(default_factory=list)
-    material_indices: List[int] = field(default_factory=list)
+    material_indices: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+    _content_hash: Optional[int] = field(default=None, init=False, repr=False)
 
     def is_empty(self) -> bool:
-        return len(self.vertices) == 0
+        return self.vertices.shape[0] == 0
+
+    @property
+    def content_hash(self) -> int:
+        # Computed on first use, so meshes that are never deduplicated (e.g. the level mesh) skip it
+        if self._content_hash is None:
+            digest = blake2b(digest_size=8)
+            digest.update(self.vertices.tobytes())
+            digest.update(self.faces.tobytes())
+            digest.update(self.normals.tobytes())
+            digest.update(self.uvs.tobytes())
+            digest.update(self.material_indices.tobytes())
+            digest.update(hash(tuple(self.materials)).to_bytes(8, "little", signed=True))
+            object.__setattr__(self, "_content_hash", int.from_bytes(digest.digest(), "little"))
+        return self._content_hash  # type: ignore
 
     def __hash__(self) -> int:
+        return self.content_hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, MeshData) or self.content_hash != other.content_hash:
+            return False
+
+        # Equal digests are confirmed on the data itself, the cheap hash check rejects almost every mismatch
         return (
-            len(self.vertices)
-            + len(self.faces)
-            + len(self.material_indices)
-            + len(self.normals)
-            + len(self.uvs)
-            + sum(hash(m) for m in self.materials)
+            self.materials == other.materials
+            and np.array_equal(self.material_indices, other.material_indices)
+            and np.array_equal(self.faces, other.faces)
+            and np.array_equal(self.vertices, other.vertices)
+            and np.array_equal(self.normals, other.normals)
+            and np.array_equal(self.uvs, other.uvs)
         )
 
 
+@dataclass(frozen=True, slots=True)
+class _VisualTask:
+    path: str | Path | VfsNode
+    extension: VisualExtension
+    cached: bool = False
+    _visual: Optional[VobVisual] = field(default=None, init=False, repr=False, compare=False)
+
+    def __call__(self) -> Optional[VobVisual]:
+        if self._visual is not None:
+            return self._visual
+
+        visual = load_visual(self.path, self.extension)
+        if self.cached:
+            object.__setattr__(self, "_visual", visual)
+        return visual
+
+    def clear(self):
+        object.__setattr__(self, "_visual", None)
+
+
 def _make_loader(path: str | Path | VfsNode, extension: VisualExtension) -> VisualLoader:
-    return lambda: load_visual(path, extension)
+    # Meshes and hierarchies are shared by many visuals, keep the first load instead of re-reading it.
+    # Textures are decoded once into Blender images, so holding on to them would only cost memory.
+    return _VisualTask(path, extension, cached=extension is not VisualExtension.TEX)
+
+
+def clear_visual_cache(visuals: Dict[str, VisualLoader]):
+    for loader in visuals.values():
+        if isinstance(loader, _VisualTask):
+            loader.clear()
 
 
 def index_visuals(game_directory: Path) -> Dict[str, VisualLoader]:
     try:
-        visuals = {}
-        index_visuals_from_disk(game_directory, visuals)
-        index_visuals_from_archives(game_directory, visuals)
+        disk_visuals, archive_visuals = {}, {}
+
+        # Both sources are IO and zenkit bound, index them side by side and merge on this thread afterwards
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            disk_task = executor.submit(index_visuals_from_disk, game_directory, disk_visuals)
+            archive_task = executor.submit(index_visuals_from_archives, game_directory, archive_visuals)
+            disk_task.result()
+            archive_task.result()
+
+        # Archives take precedence over loose files, same as when they were indexed one after the other
+        visuals = disk_visuals
+        visuals.update(archive_visuals)
 
     except Exception as e:
         error("Failed to index visuals")
         raise e
 
-    info(f"Indexed {len(visuals)} visuals")
+    info("Indexed %d visuals", len(visuals))
+    return visuals
+
+
+def _source_texture_name(name: str) -> str:
+    # Compiled textures are named "<stem>-c.tex", VOBs and materials refer to them as "<stem>.tga"
+    stem = name.rpartition(".")[0]
+    if stem.endswith("-c"):
+        stem = stem[:-2]
+    return f"{stem}.tga"
+
+
+def _index_directory(path: Path) -> Dict[str, VisualLoader]:
+    visuals = {}
+    for directory, _, file_names in walk(path):
+        for file_name in file_names:
+            entry_ext = file_name.rpartition(".")[2].lower()
+
+            if entry_ext in _visual_extension_values:
+                extension = _visual_extension_by_value[entry_ext]
+                name = file_name.lower()
+
+                if extension is VisualExtension.TEX:
+                    name = _source_texture_name(name)
+
+                visuals[intern(name)] = _make_loader(join(directory, file_name), extension)
+
     return visuals
 
 
@@ -129,53 +236,62 @@ def index_visuals_from_disk(game_directory: Path, visuals: Dict[str, VisualLoade
         for category in VISUAL_CATEGORIES
     ]
 
-    stack = [entry for path in paths for entry in scandir(path)]
-    while stack:
-        entry = stack.pop()
-        if entry.is_dir():
-            stack.extend([entry for entry in scandir(entry.path)])
-            continue
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        for indexed in executor.map(_index_directory, paths):
+            visuals.update(indexed)
 
-        entry_ext = suffix(entry.name).lower()
+    info("Indexed from disk: %d", len(visuals))
 
-        if entry_ext in [ve.value for ve in VisualExtension]:
-            extension = VisualExtension(entry_ext)
-            name = entry.name.lower()
 
-            if extension is VisualExtension.TEX:
-                name = with_suffix(name.replace("-c.", "."), "tga", True)
+def _walk_vfs(root: VfsNode) -> Iterator[VfsNode]:
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.is_dir():
+            stack.extend(node.children)
+        else:
+            yield node
 
-            visuals[name] = _make_loader(entry.path, extension)
 
-    info(f"Indexed from disk: {len(visuals)}")
+def _index_archives(paths: List[str]) -> Dict[str, VisualLoader]:
+    visuals = {}
+    vfs = Vfs()
+    for path in paths:
+        vfs.mount_disk(path, clobber=VfsOverwriteBehavior.ALL)
 
+    for node in _walk_vfs(vfs.root):
+        name = node.name.lower()
+        extension = name.rpartition(".")[2]
 
-def index_visuals_from_archives(game_directory: Path, visuals: Dict[str, VisualLoader]):
-    path = None
-    for archive_path in VISUAL_ARCHIVES:
-        try:
-            path = canonical_case_path(game_directory / "data" / archive_path)
-        except FileNotFoundError:
-            continue
+        if extension in _visual_extension_values:
+            if extension == "tex":
+                name = _source_texture_name(name)
+            visuals[intern(name)] = _make_loader(node, _visual_extension_by_value[extension])
 
-        vfs = Vfs()
-        vfs.mount_disk(str(path))
-        stack = [vfs.root]
-        while stack:
-            node = stack.pop()
-            extension = suffix(node.name).lower()
+    return visuals
 
-            if extension in [ve.value for ve in VisualExtension]:
-                name = node.name.lower()
 
-                if extension == "tex":
-                    name = with_suffix(name.replace("-c.", "."), "tga", True)
-                visuals[name] = _make_loader(node, VisualExtension(extension))
+def index_visuals_from_archives(game_directory: Path, visuals: Dict[str, VisualLoader]):
+    try:
+        data_directory = canonical_case_path(game_directory / "data")
+        with scandir(data_directory) as entries:
+            archives = {entry.name.lower(): entry.path for entry in entries}
+    except FileNotFoundError:
+        archives = {}
+
+    # One Vfs per category holding its base and addon archive, so the addon still overwrites the base archive
+    category_paths: Dict[str, List[str]] = {}
+    for archive_path in VISUAL_ARCHIVES:
+        if archive_path in archives:
+            category = archive_path.removesuffix(".vdf").removesuffix("_addon")
+            category_paths.setdefault(category, []).append(archives[archive_path])
 
-            if node.is_dir():
-                stack.extend(node.children)
+    if category_paths:
+        with ThreadPoolExecutor(max_workers=len(category_paths)) as executor:
+            for indexed in executor.map(_index_archives, category_paths.values()):
+                visuals.update(indexed)
 
-    info(f"Indexed from archives: {len(visuals)}")
+    info("Indexed from archives: %d", len(visuals))
 
 
 def load_visual(path: str | Path | VfsNode, extension: VisualExtension) -> Optional[VobVisual]:
@@ -183,49 +299,44 @@ def load_visual(path: str | Path | VfsNode, extension: VisualExtension) -> Optio
 
 
 def parse_visual_data(name: str, cache: Dict[str, VisualLoader], scale: float = 0.01) -> Optional[MeshData]:
-    extension = suffix(name).lower()
-    if extension == "" or extension not in _compiled_extension:
+    stem, separator, extension = name.rpartition(".")
+    extension = extension.lower()
+    if not separator or extension not in _compiled_extension:
         return None
 
-    compiled_name = with_suffix(name, _compiled_extension[extension], True).lower()
-    return _parse_visual_data[extension](compiled_name, cache, scale)
+    return _parse_visual_data[extension](stem.lower(), cache, scale)
 
 
-def parse_visual_data_from_vob(
-    vob: VirtualObject, cache: Dict[str, VisualLoader], scale: float = 0.01
-) -> Optional[MeshData]:
-    if vob.visual is None:
-        return None
+def parse_materials(materials: List[Material]) -> List[MaterialData]:
+    raw_colors = [mat.color for mat in materials]
+    colors = np.array([(c.r, c.g, c.b, c.a) for c in raw_colors], dtype=np.float64).reshape(-1, 4)
+    colors *= 1.0 / 255.0
+
+    return [
+        MaterialData(mat.name, tuple(color), mat.texture)  # type: ignore
+        for mat, color in zip(materials, colors.tolist())
+    ]
 
-    name = vob.visual.name.lower()
-    mesh_data = parse_visual_data(name, cache, scale)
-    if not mesh_data:
-        return None
 
-    return mesh_data
+def _fan_triangulate(polygon_sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (corners, triangle_polygons): for every fan triangle the indices of its three corners
+    into the flattened per-polygon corner arrays, and the index of the polygon it came from.
+    """
+    triangle_counts = np.maximum(polygon_sizes - 2, 0)
+    polygon_starts = np.cumsum(polygon_sizes) - polygon_sizes
+    triangle_polygons = np.repeat(np.arange(len(polygon_sizes)), triangle_counts)
+    triangle_starts = np.cumsum(triangle_counts) - triangle_counts
+
+    first = polygon_starts[triangle_polygons]
+    second = first + np.arange(len(triangle_polygons)) - triangle_starts[triangle_polygons] + 1
+    return np.stack((first, second, second + 1), axis=1), triangle_polygons
 
 
 def parse_world_mesh(wrld: World, scale: float = 0.01) -> MeshData:
     bsp, mesh = wrld.bsp_tree, wrld.mesh
-    vertices, uvs, faces = [], [], []
-    normals, materials, material_indices = [], [], []
-    append_vertex, append_face = vertices.append, faces.append
-    append_material_index, append_material = material_indices.append, materials.append
-    extend_normals, extend_uvs = normals.extend, uvs.extend
-
-    for mat in mesh.materials:
-        mat_color = mat.color
-        r, g, b, a = mat_color.r, mat_color.g, mat_color.b, mat_color.a
-        inv255 = 1.0 / 255.0
-        color = (
-            r * inv255,
-            g * inv255,
-            b * inv255,
-            a * inv255,
-        )
-        append_material(MaterialData(mat.name, color, mat.texture))
+    materials = parse_materials(mesh.materials)
 
-    vertex_cache, polygon_cache = {}, set()
     positions, features, polygons, leaf_polygon_indices = (
         mesh.positions,
         mesh.features,
@@ -233,131 +344,114 @@ def parse_world_mesh(wrld: World, scale: float = 0.01) -> MeshData:
         bsp.leaf_polygon_indices,
     )
 
-    for leaf_index in leaf_polygon_indices:
-        polygon = polygons[leaf_index]
-        position_indices, feature_indices = (
-            polygon.position_indices,
-            polygon.feature_indices,
-        )
-
-        if polygon in polygon_cache or polygon.is_portal or polygon.is_ghost_occluder:
-            continue
-
-        polygon_cache.add(polygon)
-        for index in range(1, len(position_indices) - 1):
-            face = []
-            face_normals, face_uvs = [], []
-
-            for vertex_index in [0, index, index + 1]:
+    # Leaves share polygons by index, dedupe the index list in C while keeping first-seen order
+    leaf_indices = np.asarray(leaf_polygon_indices, dtype=np.int64)
+    _, first_seen = np.unique(leaf_indices, return_index=True)
+    unique_leaf_indices = leaf_indices[np.sort(first_seen)].tolist()
 
-                position_index = position_indices[vertex_index]
-                feature_index = feature_indices[vertex_index]
+    # Only polygon selection stays in Python, corners are gathered into flat index lists
+    corner_positions, corner_features, polygon_sizes, polygon_materials = [], [], [], []
+    extend_positions, extend_features = corner_positions.extend, corner_features.extend
+    append_size, append_polygon_material = polygon_sizes.append, polygon_materials.append
 
-                position = positions[position_index] * scale
-                position = (position.x, position.z, position.y)
+    for leaf_index in unique_leaf_indices:
+        polygon = polygons[leaf_index]
 
-                if position not in vertex_cache:
-                    vertex_cache[position] = len(vertices)
-                    append_vertex(position)
+        if polygon.is_portal or polygon.is_ghost_occluder:
+            continue
 
-                face.append(vertex_cache[position])
+        position_indices = polygon.position_indices
+        extend_positions(position_indices)
+        extend_features(polygon.feature_indices)
+        append_size(len(position_indices))
+        append_polygon_material(polygon.material_index)
 
-                vertex_feature = features[feature_index]
-                uv = vertex_feature.texture
-                normal = Vector([coord for coord in vertex_feature.normal])
+    corners, triangle_polygons = _fan_triangulate(np.asarray(polygon_sizes, dtype=np.int64))
+    corner_position_indices = np.asarray(corner_positions, dtype=np.int64)[corners.ravel()]
+    corner_feature_indices = np.asarray(corner_features, dtype=np.int64)[corners.ravel()]
 
-                face_uvs.append((uv.x, -uv.y))
-                face_normals.append(normal)
+    position_array = np.array(list(map(_get_xzy, positions)), dtype=np.float32).reshape(-1, 3)
+    position_array *= scale
+    feature_uvs = np.array([_get_xy(ft.texture) for ft in features], dtype=np.float32).reshape(-1, 2)
+    feature_uvs[:, 1] *= -1.0
+    feature_normals = np.array([_get_xyz(ft.normal) for ft in features], dtype=np.float32).reshape(-1, 3)
 
-            extend_uvs(face_uvs)
-            extend_normals(face_normals)
-            append_face(face)
-            append_material_index(polygon.material_index)
+    # Sort-based dedupe of corner positions, the inverse indices are the faces
+    vertices, faces = np.unique(position_array[corner_position_indices], axis=0, return_inverse=True)
+    material_indices = np.asarray(polygon_materials, dtype=np.int32)[triangle_polygons]
 
-    return MeshData(vertices, faces, normals, uvs, materials, material_indices)
+    return MeshData(
+        vertices,
+        faces.reshape(-1, 3).astype(np.int32),
+        feature_normals[corner_feature_indices],
+        feature_uvs[corner_feature_indices],
+        materials,
+        material_indices,
+    )
 
 
 def parse_multi_resolution_mesh(mrm: MultiResolutionMesh, scale: float = 0.01) -> MeshData:
-    vertices, uvs, faces = [], [], []
-    normals, materials, material_indices = [], [], []
-    append_vertex, append_face = vertices.append, faces.append
-    append_material_index = material_indices.append
-    extend_normals, extend_uvs = normals.extend, uvs.extend
-
-    for mat in mrm.material:
-        mat_color = mat.color
-        r, g, b, a = mat_color.r, mat_color.g, mat_color.b, mat_color.a
-        inv255 = 1.0 / 255.0
-        color = (
-            r * inv255,
-            g * inv255,
-            b * inv255,
-            a * inv255,
-        )
-        materials.append(MaterialData(mat.name, color, mat.texture))
+    materials = parse_materials(mrm.material)
+    position_chunks, normal_chunks, uv_chunks, material_chunks = [], [], [], []
+
+    positions = np.array(list(map(_get_xzy, mrm.positions)), dtype=np.float32).reshape(-1, 3)
+    positions *= scale
 
-    positions, vertex_cache = [Vector((pos.x, pos.y, pos.z)) for pos in mrm.positions], {}
     for submesh_index, submesh in enumerate(mrm.submeshes):
         wedges = submesh.wedges
         triangles = submesh.triangles
 
-        for triangle in triangles:
-            triangle_wedges = triangle.wedges
-            face, face_normals, face_uvs = [], [], []
-
-            for i in range(3):
-                wedge = wedges[triangle_wedges[i]]
-                face_normals.append(Vector((wedge.normal.x, wedge.normal.z, wedge.normal.y)))
-                position = positions[wedge.index] * scale
-                position = (position.x, position.z, position.y)
-
-                if position not in vertex_cache:
-                    face_index = len(vertices)
-                    face.append(face_index)
+        # Wedge attributes are read from the bindings once per wedge, triangle corners are gathered from them
+        wedge_positions = np.array([wedge.index for wedge in wedges], dtype=np.int64)
+        wedge_normals = np.array([_get_xzy(wedge.normal) for wedge in wedges], dtype=np.float32).reshape(-1, 3)
+        wedge_uvs = np.array([_get_xy(wedge.texture) for wedge in wedges], dtype=np.float32).reshape(-1, 2)
+        wedge_uvs[:, 1] *= -1.0
+        corner_wedges = np.array([triangle.wedges for triangle in triangles], dtype=np.int64).reshape(-1)
 
-                    append_vertex(Vector(position))
-                    vertex_cache[position] = face_index
-                else:
-                    face.append(vertex_cache[position])
+        position_chunks.append(wedge_positions[corner_wedges])
+        normal_chunks.append(wedge_normals[corner_wedges])
+        uv_chunks.append(wedge_uvs[corner_wedges])
+        material_chunks.append(np.full(len(triangles), submesh_index, dtype=np.int32))
 
-                face_uvs.append((wedge.texture.x, -wedge.texture.y))
+    if not position_chunks:
+        return MeshData(materials=materials)
 
-            extend_uvs(face_uvs)
-            extend_normals(face_normals)
-            append_material_index(submesh_index)
-            append_face(face)
+    corner_array = positions[np.concatenate(position_chunks)]
+    vertices, faces = np.unique(corner_array, axis=0, return_inverse=True)
 
-    return MeshData(vertices, faces, normals, uvs, materials, material_indices)
-
-
-def parse_decal_mesh(vob: VirtualObject, scale: float = 0.01) -> Optional[MeshData]:
-    visual_name = vob.visual.name.lower()
-    visual: VisualDecal = vob.visual  # type: ignore
-    material = MaterialData(trim_suffix(visual_name), (1.0, 1.0, 1.0, 1.0), visual_name)
-    dimension_x, dimension_y = (
-        visual.dimension.x * scale,
-        visual.dimension.y * scale,
+    return MeshData(
+        vertices,
+        faces.reshape(-1, 3).astype(np.int32),
+        np.concatenate(normal_chunks),
+        np.concatenate(uv_chunks),
+        materials,
+        np.concatenate(material_chunks),
     )
 
-    v0 = Vector((-dimension_x, 0, -dimension_y))  # Bottom-left
-    v1 = Vector((dimension_x, 0, -dimension_y))  # Bottom-right
-    v2 = Vector((dimension_x, 0, dimension_y))  # Top-right
-    v3 = Vector((-dimension_x, 0, dimension_y))  # Top-left
-
-    vertices = [v0, v1, v2, v3]
-    vertices += [v0.copy(), v1.copy(), v2.copy(), v3.copy()]
 
-    faces = [
+# Unit decal quad, front side and a copy with flipped winding for the back side, scaled per VOB by its dimensions
+_decal_unit_vertices = np.array(
+    [
+        (-1.0, 0.0, -1.0),  # Bottom-left
+        (1.0, 0.0, -1.0),  # Bottom-right
+        (1.0, 0.0, 1.0),  # Top-right
+        (-1.0, 0.0, 1.0),  # Top-left
+    ]
+    * 2,
+    dtype=np.float32,
+)
+_decal_faces = np.array(
+    [
         (0, 1, 2),
         (0, 2, 3),
         (6, 5, 4),  # Flipped winding
         (7, 6, 4),  # Flipped winding
-    ]
-
-    normals = [Vector((0, 0, 1))] * 3 * 2  # 6 normals: 3 per triangle × 2 sides
-    normals += [Vector((0, 0, -1))] * 3 * 2
-
-    uvs = [
+    ],
+    dtype=np.int32,
+)
+_decal_normals = np.array([(0.0, 0.0, 1.0)] * 6 + [(0.0, 0.0, -1.0)] * 6, dtype=np.float32)  # 3 per triangle
+_decal_uvs = np.array(
+    [
         # Front face
         (0.0, 0.0),  # v0
         (1.0, 0.0),  # v1
@@ -372,29 +466,60 @@ def parse_decal_mesh(vob: VirtualObject, scale: float = 0.01) -> Optional[MeshDa
         (0.0, 1.0),  # v3
         (1.0, 1.0),  # v2
         (0.0, 0.0),  # v0
-    ]
+    ],
+    dtype=np.float32,
+)
+_decal_material_indices = np.zeros(len(_decal_faces), dtype=np.int32)
+
+
+def parse_decal_mesh(vob: VirtualObject, scale: float = 0.01) -> Optional[MeshData]:
+    visual_name = vob.visual.name.lower()
+    visual: VisualDecal = vob.visual  # type: ignore
+    material = MaterialData(trim_suffix(visual_name), (1.0, 1.0, 1.0, 1.0), visual_name)
+    dimensions = np.array((visual.dimension.x, 1.0, visual.dimension.y), dtype=np.float32) * scale
+
+    # Only the vertices depend on the VOB, topology, normals and uvs are shared between all decals
+    return MeshData(
+        vertices=_decal_unit_vertices * dimensions,
+        faces=_decal_faces,
+        normals=_decal_normals,
+        uvs=_decal_uvs,
+        materials=[material],
+        material_indices=_decal_material_indices,
+    )
 
-    materials = [material]
-    material_indices = [0, 0, 0, 0]
+
+def _merge_mesh_parts(parts: List[Tuple[np.ndarray, MeshData]]) -> MeshData:
+    """
+    Joins (vertices, mesh) parts into one mesh, where vertices are the part's already transformed vertices.
+    Face and material indices are shifted by each part's offsets in a single vectorized add.
+    """
+    materials = [material for _, mesh in parts for material in mesh.materials]
+    if not parts:
+        return MeshData(materials=materials)
+
+    vertex_counts = np.array([len(vertices) for vertices, _ in parts], dtype=np.int32)
+    face_counts = np.array([len(mesh.faces) for _, mesh in parts], dtype=np.int32)
+    material_counts = np.array([len(mesh.materials) for _, mesh in parts], dtype=np.int32)
+    vertex_offsets = np.repeat(np.cumsum(vertex_counts, dtype=np.int32) - vertex_counts, face_counts)
+    material_offsets = np.repeat(np.cumsum(material_counts, dtype=np.int32) - material_counts, face_counts)
 
     return MeshData(
-        vertices=vertices,
-        faces=faces,
-        normals=normals,
-        uvs=uvs,
-        materials=materials,
-        material_indices=material_indices,
+        np.concatenate([vertices for vertices, _ in parts]),
+        np.concatenate([mesh.faces for _, mesh in parts]) + vertex_offsets[:, np.newaxis],
+        np.concatenate([mesh.normals for _, mesh in parts]),
+        np.concatenate([mesh.uvs for _, mesh in parts]),
+        materials,
+        np.concatenate([mesh.material_indices for _, mesh in parts]) + material_offsets,
     )
 
 
 def parse_mesh_attachments(
     mdm: ModelMesh, mdh: ModelHierarchy, scale: float = 0.01
-) -> Tuple[MeshData, Tuple[int, int]]:
+) -> List[Tuple[np.ndarray, MeshData]]:
     nodes = mdh.nodes
     attachments = mdm.attachments
-    vertices, faces, normals = [], [], []
-    uvs, materials, material_indices = [], [], []
-    vertex_offset, material_offset = 0, 0
+    parts = []
     buffer = {}
 
     for index, node in enumerate(nodes):
@@ -404,86 +529,50 @@ def parse_mesh_attachments(
         attachment = attachments[node.name]
         mesh = parse_multi_resolution_mesh(attachment, scale)
 
-        node_transform = node.transform
+        # Columns are fetched from the binding once, the matrix is built from its rows in a single constructor call
+        x_axis, y_axis, z_axis, origin = node.transform.columns
         node_matrix = Matrix(
-            [
-                [col.x for col in node_transform.columns[:3]],
-                [col.y for col in node_transform.columns[:3]],
-                [col.z for col in node_transform.columns[:3]],
-            ]
-        ).to_4x4()
-
-        translation = (
-            Vector(
-                (
-                    node_transform.columns[3].x,
-                    node_transform.columns[3].y,
-                    node_transform.columns[3].z,
-                )
+            (
+                (x_axis.x, y_axis.x, z_axis.x, origin.x * scale),
+                (x_axis.y, y_axis.y, z_axis.y, origin.y * scale),
+                (x_axis.z, y_axis.z, z_axis.z, origin.z * scale),
+                (0.0, 0.0, 0.0, 1.0),
             )
-            * scale
         )
-        node_matrix.translation = translation
         world_matrix = Matrix()
 
         if node.parent != -1 and node.parent in buffer:
             parent_transform = buffer[node.parent]
             world_matrix = parent_transform @ node_matrix
         else:
-            world_matrix = BASE_ROTATION_MATRIX @ BASE_SCALE_MATRIX @ node_matrix
+            world_matrix = BASE_TRANSFORM @ node_matrix
 
         buffer[index] = world_matrix
-        world_matrix = world_matrix @ BASE_ROTATION_MATRIX @ BASE_SCALE_MATRIX
+        world_matrix = world_matrix @ BASE_TRANSFORM
 
-        vertices_relative_to_parent = [world_matrix @ vertex for vertex in mesh.vertices]
+        # Affine transform of all vertices at once: rotation/scale block plus translation
+        rotation = np.array(world_matrix.to_3x3(), dtype=np.float32)
+        translation = np.array(world_matrix.translation, dtype=np.float32)
+        vertices_relative_to_parent = mesh.vertices @ rotation.T + translation
 
-        faces.extend(tuple(idx + vertex_offset for idx in face) for face in mesh.faces)
-        material_indices.extend(idx + material_offset for idx in mesh.material_indices)
-        materials.extend(mesh.materials)
-        vertices.extend(vertices_relative_to_parent)
-        normals.extend(mesh.normals)
-        uvs.extend(mesh.uvs)
+        parts.append((vertices_relative_to_parent, mesh))
 
-        vertex_offset += len(mesh.vertices)
-        material_offset += len(mesh.materials)
-
-    return MeshData(vertices, faces, normals, uvs, materials, material_indices), (
-        vertex_offset,
-        material_offset,
-    )
+    return parts
 
 
 def parse_model_mesh(mdm: ModelMesh, mdh: ModelHierarchy, scale: float = 0.01) -> MeshData:
     soft_skin_meshes = mdm.meshes
     root_translation = mdh.root_translation
-    root_translation = Vector((root_translation.x, root_translation.z, root_translation.y)) * scale
-    parsed_attachments, (vertex_offset, material_offset) = parse_mesh_attachments(mdm, mdh, scale)
-    vertices, faces, normals, uvs, materials, material_indices = (
-        parsed_attachments.vertices,
-        parsed_attachments.faces,
-        parsed_attachments.normals,
-        parsed_attachments.uvs,
-        parsed_attachments.materials,
-        parsed_attachments.material_indices,
-    )
+    root_translation = np.array((root_translation.x, root_translation.z, root_translation.y), dtype=np.float32) * scale
+    parts = parse_mesh_attachments(mdm, mdh, scale)
 
     for soft_skin_mesh in soft_skin_meshes:
         mesh = parse_multi_resolution_mesh(soft_skin_mesh.mesh, scale)
+        vertices_relative_to_root = mesh.vertices - root_translation
+        parts.append((vertices_relative_to_root, mesh))
 
-        vertices_relative_to_root = [vertex - root_translation for vertex in mesh.vertices]
-        vertices.extend(vertices_relative_to_root)
-
-        faces.extend(tuple(idx + vertex_offset for idx in face) for face in mesh.faces)  # type: ignore
-        material_indices.extend(idx + material_offset for idx in mesh.material_indices)
-        materials.extend(mesh.materials)
-        vertices.extend(mesh.vertices)
-        normals.extend(mesh.normals)
-        uvs.extend(mesh.uvs)
-
-        vertex_offset += len(mesh.vertices)
-        material_offset += len(mesh.materials)
-
-    return MeshData(vertices, faces, normals, uvs, materials, material_indices)
+    # Attachments and soft skin meshes are joined once, instead of growing the buffers part by part
+    return _merge_mesh_parts(parts)
 
 
 def parse_morph_mesh(mmb: MorphMesh, scale: float = 0.01) -> MeshData:
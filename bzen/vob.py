@@ -1,15 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import compress
 from logging import error, info
-from typing import Dict, Optional, Tuple, cast
+from operator import attrgetter
+from sys import intern
+from typing import Callable, Dict, List, Optional, Tuple, TypeAlias, cast
 
-from mathutils import Quaternion, Vector
-from scene import BlenderObjectData
+import numpy as np
+from scene import BlenderObjectTable
 from utils import trim_suffix
 from visual import (MeshData, VisualLoader, parse_decal_mesh,
-                    parse_multi_resolution_mesh, parse_visual_data,
-                    parse_visual_data_from_vob)
-from zenkit import (DaedalusInstanceType, DaedalusVm, ItemInstance, Mat3x3,
-                    MultiResolutionMesh, Vec3f, VirtualObject, VisualType,
-                    VobType, World)
+                    parse_multi_resolution_mesh, parse_visual_data)
+from zenkit import (DaedalusInstanceType, DaedalusVm, ItemInstance,
+                    MultiResolutionMesh, VirtualObject, VisualType, VobType,
+                    World)
 
 invisible_vob = {
     VobType.zCVobStartpoint: "invisible_zcvobstartpoint.mrm",
@@ -32,6 +36,16 @@ invisible_vob = {
 }
 
 
+MeshParser: TypeAlias = Callable[[], Optional[MeshData]]
+
+_get_xyz = attrgetter("x", "y", "z")
+
+
+@lru_cache(maxsize=4096)
+def _trim_lower(visual_name: str) -> str:
+    return trim_suffix(visual_name).lower()
+
+
 class ParseMeshError(Exception):
     def __init__(self, message: str):
         super().__init__(message)
@@ -42,127 +56,169 @@ class ParseItemVisualError(Exception):
         super().__init__(message)
 
 
-def get_blender_obj_quaternion_rotation(matrix: Mat3x3) -> Quaternion:
-    quat = matrix.to_quaternion()
-    quat = Quaternion((quat.w, quat.x, quat.z, quat.y))
-    return quat
+def get_blender_obj_quaternion_rotations(matrices: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Mat3x3.to_quaternion for an (N, 3, 3) stack of matrices laid out like Mat3x3.columns.
+    Returns (N, 4) quaternions in Blender order (w, x, z, y).
+    """
+    m = matrices
+    m00, m01, m02 = m[:, 0, 0], m[:, 0, 1], m[:, 0, 2]
+    m10, m11, m12 = m[:, 1, 0], m[:, 1, 1], m[:, 1, 2]
+    m20, m21, m22 = m[:, 2, 0], m[:, 2, 1], m[:, 2, 2]
+    trace = m00 + m11 + m22
+
+    # Every branch is evaluated for all matrices and the matching one is selected per row
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = 0.5 / np.sqrt(trace + 1.0)
+        by_trace = np.stack((0.25 / s, (m21 - m12) * s, (m02 - m20) * s, (m10 - m01) * s), axis=1)
+        s = 2.0 * np.sqrt(1.0 + m00 - m11 - m22)
+        by_x = np.stack(((m21 - m12) / s, 0.25 * s, (m01 + m10) / s, (m02 + m20) / s), axis=1)
+        s = 2.0 * np.sqrt(1.0 + m11 - m00 - m22)
+        by_y = np.stack(((m02 - m20) / s, (m01 + m10) / s, 0.25 * s, (m12 + m21) / s), axis=1)
+        s = 2.0 * np.sqrt(1.0 + m22 - m00 - m11)
+        by_z = np.stack(((m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, 0.25 * s), axis=1)
+
+    use_trace = trace > 0
+    use_x = ~use_trace & (m00 > m11) & (m00 > m22)
+    use_y = ~use_trace & ~use_x & (m11 > m22)
+    quats = np.select([use_trace[:, None], use_x[:, None], use_y[:, None]], [by_trace, by_x, by_y], by_z)
+
+    return quats[:, (0, 1, 3, 2)]
+
+
+def get_blender_obj_track_rotations(directions: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Vector.to_track_quat("Y", "Z") for an (N, 3) stack of directions in Blender axes.
+    Returns (N, 4) quaternions (w, x, y, z), zero-length directions map to the identity.
+    """
+    length = np.linalg.norm(directions, axis=1)
+    dx, dy, dz = directions[:, 0], directions[:, 1], directions[:, 2]
+
+    # Shortest arc from +Y to the direction, with +Z as the rotation axis when the direction is (anti)parallel to Y
+    axis = np.stack((dz, np.zeros_like(dz), np.where(np.abs(dx) + np.abs(dz) < 1e-4, 1.0, -dx)), axis=1)
+    axis /= np.linalg.norm(axis, axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        half_angle = 0.5 * np.arccos(np.clip(dy / length, -1.0, 1.0))
+    w, (x, y, z) = np.cos(half_angle), (axis * np.sin(half_angle)[:, None]).T
+
+    # Roll about the direction so the rotated +Z points up as far as possible
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roll = 0.5 * np.arctan2(2.0 * (x * z + w * y), 1.0 - 2.0 * (x * x + y * y))
+        roll_w, (roll_x, roll_y, roll_z) = np.cos(roll), (directions * (np.sin(roll) / length)[:, None]).T
+
+    quats = np.stack(
+        (
+            roll_w * w - roll_x * x - roll_y * y - roll_z * z,
+            roll_w * x + roll_x * w + roll_y * z - roll_z * y,
+            roll_w * y - roll_x * z + roll_y * w + roll_z * x,
+            roll_w * z + roll_x * y - roll_y * x + roll_z * w,
+        ),
+        axis=1,
+    )
+    quats[length == 0.0] = (1.0, 0.0, 0.0, 0.0)
+
+    return quats
 
 
-def get_blender_obj_position(vector: Vec3f, scale: float = 0.01) -> Vector:
-    x, y, z = vector
-    return Vector((x * scale, z * scale, y * scale))
+def get_blender_obj_positions(positions: np.ndarray, scale: float = 0.01) -> np.ndarray:
+    return positions[:, (0, 2, 1)] * scale
 
 
-def get_special_blender_obj_data(
-    vob: VirtualObject,
-    mesh_cache: Dict[str, MeshData],
-    visuals_cache: Dict[str, VisualLoader],
-    scale: float = 0.01,
-) -> Tuple[str, BlenderObjectData]:
-    vob_name = vob.name.lower()
-    vob_type = vob.type
+def parse_invisible_meshes(visuals_cache: Dict[str, VisualLoader], scale: float = 0.01) -> Dict[str, MeshData]:
+    mesh_cache: Dict[str, MeshData] = {}
+    for vob_visual_name in dict.fromkeys(invisible_vob.values()):
+        if vob_visual_name in visuals_cache:
+            mrm = cast(MultiResolutionMesh, visuals_cache[vob_visual_name]())
+            mesh_cache[vob_visual_name] = parse_multi_resolution_mesh(mrm, scale)
+
+    return mesh_cache
 
-    if vob_type not in invisible_vob:
-        raise ValueError(f"Unknown invisible vob type: {vob_type}")
 
+def get_special_blender_obj_data(vob: VirtualObject, mesh_cache: Dict[str, MeshData]) -> Tuple[str, str]:
+    vob_name = vob.name.lower()
+    vob_type = vob.type
     vob_visual_name = invisible_vob[vob_type]
     blender_obj_name = f"invisible:{vob_name}_{vob.id}" if vob_name else f"invisible:{vob_type.name}_{vob.id}"
-    mesh_data = None
-
-    if vob_visual_name in mesh_cache:
-        mesh_data = mesh_cache[vob_visual_name]
-    else:
-        mrm = cast(MultiResolutionMesh, visuals_cache[vob_visual_name]())
-        mesh_data = parse_multi_resolution_mesh(mrm, scale)
-        if not mesh_data:
-            raise ParseMeshError(f'Could not retrieve mesh data for "{vob_name}"')
-        mesh_cache[vob_visual_name] = mesh_data
-
-    return blender_obj_name, BlenderObjectData(
-        name=vob_name,
-        mesh=mesh_data,
-        position=get_blender_obj_position(vob.position, scale),
-        rotation=get_blender_obj_quaternion_rotation(vob.rotation),
-    )
+
+    if vob_visual_name not in mesh_cache:
+        raise ParseMeshError(f'Could not retrieve mesh data for "{blender_obj_name}"')
+
+    return blender_obj_name, vob_visual_name
 
 
 def get_decal_blender_obj_data(
-    vob: VirtualObject, mesh_cache: Dict[str, MeshData], scale: float = 0.01
-) -> Tuple[str, BlenderObjectData]:
-    blender_obj_name = f"{trim_suffix(vob.visual.name).lower()}_{vob.id}"
-    vob_visual_name = vob.visual.name
-    mesh_data = None
-
-    if vob_visual_name in mesh_cache:
-        mesh_data = mesh_cache[vob_visual_name]
-    else:
-        mesh_data = parse_decal_mesh(vob, scale)
-        if not mesh_data:
-            raise ParseMeshError(f'Could not retrieve mesh data for "{blender_obj_name}"')
-        mesh_cache[vob_visual_name] = mesh_data
-
-    return blender_obj_name, BlenderObjectData(
-        name=vob.name.lower(),
-        mesh=mesh_data,
-        position=get_blender_obj_position(vob.position, scale),
-        rotation=get_blender_obj_quaternion_rotation(vob.rotation),
-    )
+    vob: VirtualObject, mesh_parsers: Dict[str, MeshParser], scale: float = 0.01
+) -> Tuple[str, str]:
+    vob_visual_name = intern(vob.visual.name)
+    blender_obj_name = f"{_trim_lower(vob_visual_name)}_{vob.id}"
+
+    if vob_visual_name not in mesh_parsers:
+        mesh_parsers[vob_visual_name] = partial(parse_decal_mesh, vob, scale)
+
+    return blender_obj_name, vob_visual_name
 
 
 def get_item_blender_obj_data(
     vob: VirtualObject,
     vm: DaedalusVm,
-    mesh_cache: Dict[str, MeshData],
+    mesh_parsers: Dict[str, MeshParser],
     visuals_cache: Dict[str, VisualLoader],
     scale: float = 0.01,
-) -> Tuple[str, BlenderObjectData]:
-    item_visual_name = parse_item_visual_name(vob, vm)
+    item_visual_cache: Optional[Dict[str, Optional[str]]] = None,
+) -> Tuple[str, str]:
+    item_visual_name = parse_item_visual_name(vob, vm, item_visual_cache)
     if not item_visual_name:
         raise ParseItemVisualError(f"Item {vob.name} has no visual")
 
-    blender_obj_name = f"{trim_suffix(item_visual_name).lower()}_{vob.id}"
-    mesh_data = None
-
-    if item_visual_name in mesh_cache:
-        mesh_data = mesh_cache[item_visual_name]
-    else:
-        mesh_data = parse_visual_data(item_visual_name, visuals_cache, scale)
-        if not mesh_data:
-            raise ParseMeshError(f'Could not retrieve mesh data for "{blender_obj_name}"')
-        mesh_cache[item_visual_name] = mesh_data
-
-    return blender_obj_name, BlenderObjectData(
-        name=vob.name.lower(),
-        mesh=mesh_data,
-        position=get_blender_obj_position(vob.position, scale),
-        rotation=get_blender_obj_quaternion_rotation(vob.rotation),
-    )
+    blender_obj_name = f"{_trim_lower(item_visual_name)}_{vob.id}"
+
+    if item_visual_name not in mesh_parsers:
+        mesh_parsers[item_visual_name] = partial(parse_visual_data, item_visual_name, visuals_cache, scale)
+
+    return blender_obj_name, item_visual_name
 
 
 def get_generic_blender_obj_data(
     vob: VirtualObject,
-    mesh_cache: Dict[str, MeshData],
+    mesh_parsers: Dict[str, MeshParser],
     visuals_cache: Dict[str, VisualLoader],
     scale: float = 0.01,
-) -> Tuple[str, BlenderObjectData]:
-    vob_visual_name = vob.visual.name
-    blender_obj_name = f"{trim_suffix(vob_visual_name).lower()}_{vob.id}"
-    mesh_data = None
-
-    if vob_visual_name in mesh_cache:
-        mesh_data = mesh_cache[vob_visual_name]
-    else:
-        mesh_data = parse_visual_data_from_vob(vob, visuals_cache, scale)
-        if not mesh_data:
-            raise ParseMeshError(f'Could not retrieve mesh data for "{blender_obj_name}"')
-        mesh_cache[vob_visual_name] = mesh_data
-
-    return blender_obj_name, BlenderObjectData(
-        name=vob.name.lower(),
-        mesh=mesh_data,
-        position=get_blender_obj_position(vob.position, scale),
-        rotation=get_blender_obj_quaternion_rotation(vob.rotation),
-    )
+) -> Tuple[str, str]:
+    vob_visual_name = intern(vob.visual.name)
+    blender_obj_name = f"{_trim_lower(vob_visual_name)}_{vob.id}"
+
+    if vob_visual_name not in mesh_parsers:
+        mesh_parsers[vob_visual_name] = partial(parse_visual_data, vob_visual_name, visuals_cache, scale)
+
+    return blender_obj_name, vob_visual_name
+
+
+def parse_meshes(mesh_parsers: Dict[str, MeshParser], mesh_cache: Dict[str, MeshData]):
+    # Each distinct visual is parsed once, zenkit releases the GIL while it loads, so the parses overlap
+    with ThreadPoolExecutor() as executor:
+        for mesh_key, mesh_data in zip(mesh_parsers, executor.map(lambda parse: parse(), mesh_parsers.values())):
+            if not mesh_data:
+                error('Could not retrieve mesh data for "%s"', mesh_key)
+                continue
+            mesh_cache[mesh_key] = mesh_data
+
+
+def _build_mesh_table(mesh_cache: Dict[str, MeshData], mesh_keys: List[str]) -> Tuple[List[MeshData], Dict[str, int]]:
+    meshes: List[MeshData] = []
+    mesh_ids: Dict[str, int] = {}
+    mesh_ids_by_mesh: Dict[MeshData, int] = {}
+
+    # Only meshes some VOB uses make it into the table, visuals whose parsed meshes are identical share one entry.
+    # MeshData hashes by its cached digest and confirms equality on the arrays, so a digest collision can't merge meshes
+    for mesh_key in dict.fromkeys(mesh_keys):
+        mesh_data = mesh_cache[mesh_key]
+        mesh_id = mesh_ids_by_mesh.get(mesh_data)
+        if mesh_id is None:
+            mesh_id = mesh_ids_by_mesh[mesh_data] = len(meshes)
+            meshes.append(mesh_data)
+        mesh_ids[mesh_key] = mesh_id
+
+    return meshes, mesh_ids
 
 
 def parse_blender_obj_data_from_world(
@@ -170,95 +226,132 @@ def parse_blender_obj_data_from_world(
     vm: DaedalusVm,
     visuals_cache: Dict[str, VisualLoader],
     scale: float = 0.01,
-) -> Dict[str, BlenderObjectData]:
-    blender_objects: Dict[str, BlenderObjectData] = {}
-    mesh_cache: Dict[str, MeshData] = {}
-    stack = world.root_objects
+) -> BlenderObjectTable:
+    # Invisible VOBs share a handful of placeholder meshes, parsing them up front keeps their lookup a dict read
+    mesh_cache = parse_invisible_meshes(visuals_cache, scale)
+    mesh_parsers: Dict[str, MeshParser] = {}
+    item_visual_cache: Dict[str, Optional[str]] = {}
+    names: List[str] = []
+    mesh_keys: List[str] = []
+    raw_positions, raw_rotations = [], []
+    stack = list(world.root_objects)
 
     while stack:
         vob = stack.pop()
         vob_type = vob.type
         vob_visual_type = vob.visual.type
 
-        try:
-            # Skip level mesh
-            if vob_type is VobType.zCVobLevelCompo or vob_visual_type is VisualType.PARTICLE_EFFECT:
-                stack.extend(vob.children)
-                continue
+        # Children are pushed up front, nothing below touches the stack so the visiting order is unchanged
+        children = vob.children
+        if children:
+            stack.extend(children)
+
+        # Skip level mesh
+        if vob_type is VobType.zCVobLevelCompo or vob_visual_type is VisualType.PARTICLE_EFFECT:
+            continue
 
+        try:
             # Invisible VOBs
             if vob_type in invisible_vob:
-                bobj_name, bobj_data = get_special_blender_obj_data(vob, mesh_cache, visuals_cache, scale)
-                blender_objects[bobj_name] = bobj_data
+                bobj_name, mesh_key = get_special_blender_obj_data(vob, mesh_cache)
 
             # Decals
             elif vob_visual_type is VisualType.DECAL:
-                bobj_name, bobj_data = get_decal_blender_obj_data(vob, mesh_cache, scale)
-                blender_objects[bobj_name] = bobj_data
+                bobj_name, mesh_key = get_decal_blender_obj_data(vob, mesh_parsers, scale)
 
             # Items
             elif vob_type is VobType.oCItem:
-                bobj_name, bobj_data = get_item_blender_obj_data(vob, vm, mesh_cache, visuals_cache, scale)
-                blender_objects[bobj_name] = bobj_data
+                bobj_name, mesh_key = get_item_blender_obj_data(
+                    vob, vm, mesh_parsers, visuals_cache, scale, item_visual_cache
+                )
 
             # Generic VOBs with standard visuals
             else:
-                bobj_name, bobj_data = get_generic_blender_obj_data(vob, mesh_cache, visuals_cache, scale)
-                blender_objects[bobj_name] = bobj_data
+                bobj_name, mesh_key = get_generic_blender_obj_data(vob, mesh_parsers, visuals_cache, scale)
+
+            # Transforms are collected raw and converted for all VOBs at once after the traversal
+            names.append(bobj_name)
+            mesh_keys.append(mesh_key)
+            raw_positions.append(_get_xyz(vob.position))
+            raw_rotations.append([_get_xyz(column) for column in vob.rotation.columns])
 
         except ParseMeshError as e:
-            error(f"Failed to index VOB {vob.name}: {e.__repr__()}")
+            error("Failed to index VOB %s: %r", vob.name, e)
         except ParseItemVisualError as e:
-            error(f"Failed to index VOB {vob.name}: {e.__repr__()}")
-
-        # Traverse children
-        if vob.children:
-            stack.extend(vob.children)
+            error("Failed to index VOB %s: %r", vob.name, e)
+
+    parse_meshes(mesh_parsers, mesh_cache)
+
+    # VOBs whose visual failed to parse are dropped before their transforms are converted
+    parsed = [mesh_key in mesh_cache for mesh_key in mesh_keys]
+    if not all(parsed):
+        names, mesh_keys = list(compress(names, parsed)), list(compress(mesh_keys, parsed))
+        raw_positions, raw_rotations = list(compress(raw_positions, parsed)), list(compress(raw_rotations, parsed))
+
+    meshes, mesh_ids = _build_mesh_table(mesh_cache, mesh_keys)
+    positions = get_blender_obj_positions(np.array(raw_positions, dtype=np.float64).reshape(-1, 3), scale)
+    rotations = get_blender_obj_quaternion_rotations(np.array(raw_rotations, dtype=np.float64).reshape(-1, 3, 3))
+
+    blender_objects = BlenderObjectTable(
+        names=names,
+        mesh_ids=np.array([mesh_ids[mesh_key] for mesh_key in mesh_keys], dtype=np.int32),
+        meshes=meshes,
+        positions=positions.astype(np.float32),
+        rotations=rotations.astype(np.float32),
+    )
 
-    info(f"Indexed {len(blender_objects)} VOBs")
+    info("Indexed %d VOBs", len(blender_objects))
     return blender_objects
 
 
-def parse_waynet(
-    world: World, visuals_cache: Dict[str, VisualLoader], scale: float = 0.01
-) -> Dict[str, BlenderObjectData]:
-    vobs = {}
+def parse_waynet(world: World, visuals_cache: Dict[str, VisualLoader], scale: float = 0.01) -> BlenderObjectTable:
     waynet = world.way_net
     waypoints = waynet.points
 
     wp_mrm = cast(MultiResolutionMesh, visuals_cache["invisible_zcvobwaypoint.mrm"]())
     wp_mesh = parse_multi_resolution_mesh(wp_mrm, scale)
 
+    names, raw_positions, raw_directions = [], [], []
     for waypoint in waypoints:
-        position = waypoint.position
-        direction = waypoint.direction
-
-        target_direction = Vector((direction.x, direction.z, direction.y))
-        vob_rotation = target_direction.to_track_quat("Y", "Z")
-
-        vob_position = get_blender_obj_position(position, scale)
-        vob_name = waypoint.name.lower()
-
-        vobs[vob_name] = BlenderObjectData(
-            name=vob_name,
-            mesh=wp_mesh,
-            position=vob_position,
-            rotation=vob_rotation,
-        )
+        names.append(waypoint.name.lower())
+        raw_positions.append(_get_xyz(waypoint.position))
+        raw_directions.append(_get_xyz(waypoint.direction))
+
+    positions = get_blender_obj_positions(np.array(raw_positions, dtype=np.float64).reshape(-1, 3), scale)
+    directions = get_blender_obj_positions(np.array(raw_directions, dtype=np.float64).reshape(-1, 3), 1.0)
+    rotations = get_blender_obj_track_rotations(directions)
+
+    return BlenderObjectTable(
+        names=names,
+        mesh_ids=np.zeros(len(names), dtype=np.int32),
+        meshes=[wp_mesh],
+        positions=positions.astype(np.float32),
+        rotations=rotations.astype(np.float32),
+    )
 
-    return vobs
 
+def parse_item_visual_name(
+    obj: VirtualObject, vm: DaedalusVm, item_visual_cache: Optional[Dict[str, Optional[str]]] = None
+) -> Optional[str]:
+    # Items of one instance share its visual, so the VM initializes each instance once, misses included
+    instance_name = obj.name.lower()
+    if item_visual_cache is not None and instance_name in item_visual_cache:
+        return item_visual_cache[instance_name]
 
-def parse_item_visual_name(obj: VirtualObject, vm: DaedalusVm) -> Optional[str]:
     try:
         item: ItemInstance = vm.init_instance(obj.name, DaedalusInstanceType.ITEM)  # type: ignore
 
         item_visual = item.visual
         if not item_visual:
-            error(f"Item {obj.name} has no visual")
-            return None
+            error("Item %s has no visual", obj.name)
+            item_visual = None
+        else:
+            item_visual = intern(item_visual)
 
     except AttributeError as e:
         raise ParseItemVisualError(f"Failed to get visual for {obj.name}: {e.__repr__()}")
 
+    if item_visual_cache is not None:
+        item_visual_cache[instance_name] = item_visual
+
     return item_visual
@@ -1,6 +1,5 @@
 import sys
 from pathlib import Path
-from typing import Dict
 
 script_dir = Path(__file__).parent
 if str(script_dir) not in sys.path:
@@ -12,45 +11,37 @@ from logging import error, info
 
 from utils import (blender_clean_scene, blender_parse_cli,
                    blender_save_changes, canonical_case_path,
-                   install_dependencies_locally, suffix)
+                   clear_case_cache, install_dependencies_locally, suffix)
 
 try:
-    from zenkit import DaedalusVm, Vfs, VfsNode, World
+    from zenkit import DaedalusVm, Vfs, World
 except ModuleNotFoundError:
     install_dependencies_locally()
-    from zenkit import DaedalusVm, Vfs, VfsNode, World
+    from zenkit import DaedalusVm, Vfs, World
 
 from log import logging_setup
-from scene import create_obj_from_mesh, create_vobs
-from visual import index_visuals, parse_world_mesh
+from scene import (create_obj_from_mesh, create_vobs, link_objects,
+                   preload_textures, set_visuals_cache)
+from visual import clear_visual_cache, index_visuals, parse_world_mesh
 from vob import parse_blender_obj_data_from_world, parse_waynet
 
 
 def load_world_from_archive(name: str, game_directory: Path) -> World:
-    matches: Dict[Path, VfsNode] = {}
-    for path in (
-        canonical_case_path(game_directory / "data" / archive) for archive in ["worlds.vdf", "worlds_addon.vdf"]
-    ):
-        if not path.exists():
+    # The addon archive overrides the base one, so it is searched first and the first match wins
+    for archive in ("worlds_addon.vdf", "worlds.vdf"):
+        try:
+            path = canonical_case_path(game_directory / "data" / archive)
+        except FileNotFoundError:
             continue
 
         vfs = Vfs()
         vfs.mount_disk(path)
-        stack = [vfs.root]
-        while stack:
-            node = stack.pop()
-            if node.name.lower() == name.lower():
-                matches[path] = node
-                break
-            if node.is_dir():
-                stack.extend(node.children)
-
-    if matches:
-        archive_names, nodes = tuple(matches.keys()), tuple(matches.values())
-        info(f"Loading from archive: {archive_names[-1]}")
-        return World.load(nodes[-1])
-    else:
-        raise Exception('Could not find world in "data/worlds.vdf" or "data/worlds_addon.vdf"')
+        node = vfs.find(name)
+        if node is not None:
+            info("Loading from archive: %s", path)
+            return World.load(node)
+
+    raise Exception('Could not find world in "data/worlds.vdf" or "data/worlds_addon.vdf"')
 
 
 def load_world_from_disk(name: str, game_directory: Path) -> World:
@@ -96,10 +87,10 @@ def main():
 
         logging_setup(args.verbosity, output_path.with_name(f"{output_path.stem}.log"))
 
-        info(f"Cleaning scene")
+        info("Cleaning scene")
         blender_clean_scene()
 
-        info(f"Loading world")
+        info("Loading world")
         world = load_world(input_file_name, game_directory)
 
         if not len(world.root_objects):
@@ -114,13 +105,15 @@ def main():
         info("Indexing visuals")
         visuals = index_visuals(game_directory)
 
+        # All game paths are resolved by now, release the cached directory listings
+        clear_case_cache()
+
         info("Indexing VOBs")
         vobs = parse_blender_obj_data_from_world(world, vm, visuals, scale)
 
         if should_parse_waynet:
             info("Parsing waynet")
-            waynet_data = parse_waynet(world, visuals, scale)
-            vobs.update(waynet_data)
+            vobs = vobs.concatenate(parse_waynet(world, visuals, scale))
 
         if len(vobs) == 0:
             error("Attention! No VOB entries were found during parsing!")
@@ -131,13 +124,22 @@ def main():
         if wrld_mesh_data.is_empty():
             error("Attention! World mesh is empty!")
 
+        # Every mesh visual has been parsed into MeshData by now, drop the loaded zenkit objects
+        clear_visual_cache(visuals)
+        set_visuals_cache(visuals)
+
+        info("Decoding textures")
+        preload_textures([wrld_mesh_data, *vobs.meshes])
+
+        material_cache = {}
+
         info("Creating world")
-        create_obj_from_mesh("LEVEL", wrld_mesh_data, visuals)
+        link_objects([create_obj_from_mesh("LEVEL", wrld_mesh_data, material_cache)])
 
         info("Creating VOBs")
-        create_vobs(vobs, visuals)
+        create_vobs(vobs, material_cache)
 
-        info(f"Saving to {output_path}...")
+        info("Saving to %s...", output_path)
         blender_save_changes(filepath=str(output_path))
         info("Done.")
 